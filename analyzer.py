@@ -2,10 +2,22 @@ import streamlit as st
 import re
 import random
 import datetime
-import requests
-from googleapiclient.discovery import build
-from collections import Counter
 import time
+import os
+import io
+import pandas as pd
+from scoring import DEFAULT_RUBRIC_PATH
+from seo_core import (
+    URL_DATABASE_ONLINE, VIRAL_EMOJIS, fetch_power_words, TAG_CHAR_LIMIT, DESCRIPTION_CHAR_LIMIT, extract_keywords_from_title,
+    smart_truncate, generate_tags, generate_description, tags_length, keyword_corpus_scores
+)
+from export import iter_packages, write_jsonl, write_zip
+from dedupe import find_near_duplicates
+from history import AuditHistory
+from audit import (
+    AuditError, build_title_rubric, youtube_client, run_channel_audit, history_columns,
+    save_snapshot, load_snapshot, snapshot_age, format_age, load_failure, load_watchlist, watch_channel, unwatch_channel
+)
 
 # --- 1. CONFIG ---
 st.set_page_config(
@@ -125,35 +137,26 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 3. DATABASE CONFIG ---
-URL_DATABASE_ONLINE = "https://gist.githubusercontent.com/rhanierex/f2d76f11df8d550376d81b58124d3668/raw/0b58a1eb02a7cffc2261a1c8d353551f3337001c/gistfile1.txt"
-FALLBACK_POWER_WORDS = ["secret", "best", "exposed", "tutorial", "guide", "review", "tips", "ultimate", "proven", "insane", "shocking", "amazing", "perfect", "easy", "fast", "free"]
-VIRAL_EMOJIS = ["🔥", "😱", "🔴", "✅", "❌", "🎵", "⚠️", "⚡", "🚀", "💰", "💯", "🤯", "😭", "😡", "😴", "🌙", "✨", "💤", "🌧️", "🎹", "🎯", "💎", "🏆", "👑"]
-STOP_WORDS = {"the", "and", "or", "for", "to", "in", "on", "at", "by", "with", "a", "an", "is", "it", "of", "that", "this", "video", "how", "what", "why", "when"}
+MAX_DUPLICATE_SCAN = 5000
+MAX_DUPLICATE_GROUPS_SHOWN = 20
+RUBRIC_PATH = DEFAULT_RUBRIC_PATH
 
 # --- 4. ENHANCED DATA LOADING ---
 @st.cache_data(ttl=600)
 def load_power_words(url):
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if isinstance(data, list):
-                return data, "🟢 Database Online"
-    except:
-        pass
-    return FALLBACK_POWER_WORDS, "🟠 Using Offline Database"
+    return fetch_power_words(url)
 
 POWER_WORDS_DB, db_status = load_power_words(URL_DATABASE_ONLINE)
 
-# --- 5. CORE LOGIC (ENHANCED V22) ---
+@st.cache_resource
+def load_title_rubric(path, mtime, power_words):
+    """Compile the scoring rubric once per config version and word list"""
+    return build_title_rubric(power_words, path)
 
-def smart_truncate(text, max_length):
-    """Truncate text intelligently at word boundaries"""
-    text = text.strip()
-    if len(text) <= max_length:
-        return text
-    truncated = text[:max_length-3].rsplit(' ', 1)[0]
-    return truncated + "..."
+TITLE_RUBRIC = load_title_rubric(RUBRIC_PATH, os.path.getmtime(RUBRIC_PATH), tuple(POWER_WORDS_DB))
+AUDIT_HISTORY = AuditHistory()
+
+# --- 5. CORE LOGIC (ENHANCED V22) ---
 
 def clean_title_text(title, keyword):
     """Remove keyword duplicates and clean formatting"""
@@ -165,106 +168,6 @@ def clean_title_text(title, keyword):
     clean = re.sub(r'\s+', ' ', clean)
     return clean
 
-def extract_keywords_from_title(title, top_n=5):
-    """Extract most important keywords using frequency analysis"""
-    words = re.findall(r'\b[a-z]{3,}\b', title.lower())
-    filtered = [w for w in words if w not in STOP_WORDS]
-    counter = Counter(filtered)
-    return [word for word, _ in counter.most_common(top_n)]
-
-def generate_tags(title, keyword, enhanced=True):
-    """Generate optimized tags with variations"""
-    tags = set()
-    year = datetime.datetime.now().year
-    
-    # Add primary keyword
-    tags.add(keyword.lower())
-    tags.add(f"{keyword.lower()} {year}")
-    
-    # Extract from title
-    clean_title = re.sub(r'[^\w\s]', '', title.lower())
-    words = clean_title.split()
-    
-    for word in words:
-        if word not in STOP_WORDS and len(word) > 2:
-            tags.add(word)
-    
-    if enhanced:
-        # Add keyword variations
-        kw_words = keyword.lower().split()
-        if len(kw_words) > 1:
-            tags.add(kw_words[0])
-            tags.add(' '.join(kw_words[:2]))
-        
-        # Add related search terms
-        extracted = extract_keywords_from_title(title)
-        for kw in extracted[:3]:
-            tags.add(kw)
-            tags.add(f"{kw} {year}")
-    
-    return list(tags)[:20]
-
-def generate_description(title, keyword, tags, enhanced=True):
-    """Generate SEO-optimized description"""
-    year = datetime.datetime.now().year
-    month = datetime.datetime.now().strftime("%B")
-    
-    top_tags = tags[:5]
-    hashtags = ' '.join([f"#{tag.replace(' ', '')}" for tag in top_tags])
-    
-    if enhanced:
-        return f"""🎬 **{title}**
-
-📌 **About This Video:**
-In this comprehensive guide, we dive deep into **{keyword}**. Whether you're a beginner or advanced, this {year} tutorial will help you master {keyword}.
-
-⏱️ **Timestamps:**
-0:00 - Introduction
-0:45 - What is {keyword}?
-2:30 - Step-by-step {keyword} guide
-5:15 - Pro tips and tricks
-7:30 - Common mistakes to avoid
-9:00 - Conclusion & Next steps
-
-🔥 **Why Watch This?**
-✅ Updated for {month} {year}
-✅ Practical examples
-✅ Expert insights
-✅ Proven techniques
-
-💡 **Related Topics:**
-{', '.join(top_tags)}
-
-🔔 **Don't Forget to:**
-• SUBSCRIBE for more content
-• LIKE if this helped you
-• COMMENT your questions below
-• SHARE with friends
-
-📱 **Follow Us:**
-[Add your social media links]
-
-{hashtags}
-
----
-© {year} | {keyword.title()} Guide | All Rights Reserved
-"""
-    else:
-        return f"""🔴 **{title}**
-
-In this video, we explore **{keyword}**. Complete guide for {year}.
-
-👇 **Timestamps:**
-0:00 Intro
-0:30 {keyword.title()}
-5:00 Conclusion
-
-🔔 **SUBSCRIBE!**
-
-#Hashtags:
-{hashtags}
-"""
-
 def generate_smart_suggestions(original_title, keyword, api_key=None, count=5):
     """Generate multiple title variations with different strategies"""
     suggestions = []
@@ -274,7 +177,7 @@ def generate_smart_suggestions(original_title, keyword, api_key=None, count=5):
     power_word = random.choice(POWER_WORDS_DB).upper()
     if api_key:
         try:
-            yt = build('youtube', 'v3', developerKey=api_key)
+            yt = youtube_client(api_key)
             res = yt.search().list(
                 q=keyword, 
                 type='video', 
@@ -326,86 +229,11 @@ def generate_smart_suggestions(original_title, keyword, api_key=None, count=5):
 
 def analyze_title(title, keyword=""):
     """Comprehensive title analysis with detailed scoring"""
-    score = 0
-    checks = []
-    recommendations = []
-    
-    title_len = len(title)
-    
-    # 1. Length Analysis (25 points)
-    if 40 <= title_len <= 60:
-        score += 25
-        checks.append(("success", f"✅ Perfect Length ({title_len} chars)"))
-    elif 30 <= title_len <= 70:
-        score += 20
-        checks.append(("warning", f"⚠️ Good Length ({title_len} chars)"))
-    elif title_len <= 100:
-        score += 10
-        checks.append(("warning", f"⚠️ Acceptable ({title_len} chars)"))
-        recommendations.append("Consider shortening to 40-60 characters for better CTR")
-    else:
-        checks.append(("error", f"❌ Too Long ({title_len} chars)"))
-        recommendations.append("CRITICAL: Shorten to under 100 characters")
-    
-    # 2. Keyword Analysis (25 points)
-    if keyword:
-        kw_lower = keyword.lower()
-        title_lower = title.lower()
-        
-        if kw_lower in title_lower:
-            position = title_lower.find(kw_lower)
-            if position < 10:
-                score += 25
-                checks.append(("success", "✅ Keyword at Start (SEO Perfect)"))
-            elif position < 30:
-                score += 20
-                checks.append(("success", "✅ Keyword in First Half"))
-            else:
-                score += 15
-                checks.append(("warning", "⚠️ Keyword Present (Move Forward)"))
-                recommendations.append("Move keyword closer to the beginning")
-        else:
-            checks.append(("error", "❌ Keyword Missing"))
-            recommendations.append("CRITICAL: Add your target keyword")
-    else:
-        score += 25
-    
-    # 3. Power Words (20 points)
-    power_found = [pw for pw in POWER_WORDS_DB if pw.lower() in title.lower()]
-    if power_found:
-        score += 20
-        checks.append(("success", f"✅ Power Words: {', '.join(power_found[:2])}"))
-    else:
-        checks.append(("warning", "⚠️ No Power Words"))
-        recommendations.append(f"Add power words like: {', '.join(random.sample(POWER_WORDS_DB, 3))}")
-    
-    # 4. Numbers (10 points)
-    numbers = re.findall(r'\d+', title)
-    if numbers:
-        score += 10
-        checks.append(("success", f"✅ Numbers Present: {', '.join(numbers)}"))
-    else:
-        checks.append(("info", "ℹ️ Consider Adding Numbers"))
-        recommendations.append("Add numbers for higher CTR (e.g., '5 Tips', '2024')")
-    
-    # 5. Brackets/Parentheses (10 points)
-    if re.search(r'[\[\(\]\)]', title):
-        score += 10
-        checks.append(("success", "✅ Brackets/Parentheses Used"))
-    else:
-        checks.append(("info", "ℹ️ Add Brackets for Clarity"))
-        recommendations.append("Use brackets for additional context [2024 Update]")
-    
-    # 6. Emoji Usage (10 points)
-    emoji_found = [e for e in VIRAL_EMOJIS if e in title]
-    if emoji_found:
-        score += 10
-        checks.append(("success", f"✅ Emoji: {' '.join(emoji_found)}"))
-    else:
-        checks.append(("info", "ℹ️ Add Emoji for Visibility"))
-        recommendations.append(f"Add trending emoji: {' '.join(random.sample(VIRAL_EMOJIS, 3))}")
-    
-    return min(score, 100), checks, recommendations
+    return TITLE_RUBRIC.analyze(title, keyword)
+
+def score_title(title, keyword=""):
+    """Score-only analysis for bulk and audit paths (skips messages)"""
+    return TITLE_RUBRIC.score(title, keyword)
 
 # --- 6. UI COMPONENTS ---
 
@@ -446,6 +274,184 @@ def render_progress_bar(score):
     </div>
     """, unsafe_allow_html=True)
 
+def render_duplicate_clusters(titles, clusters):
+    """Render near-duplicate title clusters"""
+    if not clusters:
+        st.success("✅ No near-duplicate titles found")
+        return
+    
+    duplicated = sum(len(c) for c in clusters)
+    st.warning(f"⚠️ {duplicated}/{len(titles)} titles fall into {len(clusters)} near-duplicate groups")
+    
+    for members in clusters[:MAX_DUPLICATE_GROUPS_SHOWN]:
+        with st.expander(f"🧬 {len(members)} titles like: {titles[members[0]][:60]}"):
+            for i in members[:50]:
+                st.caption(f"• {titles[i]}")
+            if len(members) > 50:
+                st.caption(f"... and {len(members) - 50} more")
+
+def export_payload(items, writer):
+    """Build one export file by streaming packages straight into the writer"""
+    corpus = keyword_corpus_scores(item["title"] for item in items)
+    buf = io.BytesIO()
+    writer(iter_packages(items, corpus_scores=corpus), buf)
+    return buf.getvalue()
+
+def render_export_buttons(items, key):
+    """Offer tags + description packages for many titles as downloads
+    
+    The files are only generated when a download button is clicked, so
+    rendering an audit or bulk result doesn't build packages nobody asked for.
+    """
+    st.caption(f"Tags and descriptions for {len(items)} videos, within the {TAG_CHAR_LIMIT}/{DESCRIPTION_CHAR_LIMIT} character limits")
+    col_jsonl, col_zip = st.columns(2)
+    with col_jsonl:
+        st.download_button("⬇️ Download JSONL", lambda: export_payload(items, write_jsonl), file_name="metadata_packages.jsonl", mime="application/json", key=f"{key}_jsonl", on_click="ignore", use_container_width=True)
+    with col_zip:
+        st.download_button("⬇️ Download ZIP", lambda: export_payload(items, write_zip), file_name="metadata_packages.zip", mime="application/zip", key=f"{key}_zip", on_click="ignore", use_container_width=True)
+
+def fetch_upload_titles(yt, playlist_id, max_titles):
+    """Page through an uploads playlist and collect video titles"""
+    titles = []
+    page_token = None
+    while len(titles) < max_titles:
+        res = yt.playlistItems().list(
+            playlistId=playlist_id,
+            part='snippet',
+            maxResults=50,
+            pageToken=page_token
+        ).execute()
+        titles.extend(item['snippet']['title'] for item in res.get('items', []))
+        page_token = res.get('nextPageToken')
+        if not page_token:
+            break
+    return titles[:max_titles]
+
+def render_channel_audit(snapshot, freshness, api_key=None, yt=None, full_dup_scan=False):
+    """Render a Channel Audit snapshot (live or precomputed)"""
+    channel = snapshot["channel"]
+    videos = snapshot["videos"]
+    
+    st.markdown("---")
+    
+    # Channel Header
+    col_img, col_info = st.columns([1, 4])
+    
+    with col_img:
+        st.image(channel["thumbnail"], width=150)
+    
+    with col_info:
+        st.markdown(f"## {channel['title']}")
+        st.caption(channel["description"][:200] + "...")
+        st.caption(freshness)
+        
+        m1, m2, m3, m4 = st.columns(4)
+        with m1:
+            st.metric("👥 Subscribers", f"{channel['subscribers']:,}")
+        with m2:
+            st.metric("👁️ Total Views", f"{channel['views']:,}")
+        with m3:
+            st.metric("🎬 Videos", f"{channel['videos']:,}")
+        with m4:
+            avg_views = channel["views"] / max(channel["videos"], 1)
+            st.metric("📊 Avg Views", f"{int(avg_views):,}")
+    
+    st.markdown("---")
+    st.markdown(f"### 📹 Latest {len(videos)} Videos Analysis")
+    
+    all_scores = [v["score"] for v in videos]
+    
+    for idx, video in enumerate(videos, 1):
+        score = video["score"]
+        
+        st.markdown('<div class="video-card">', unsafe_allow_html=True)
+        
+        col_thumb, col_content, col_score = st.columns([1, 5, 1])
+        
+        with col_thumb:
+            st.image(video["thumbnail"], width=120)
+        
+        with col_content:
+            st.markdown(f"**#{idx}. {video['title']}**")
+            st.caption(f"📅 Published: {video['published']} | 👁️ {video['views']:,} views")
+            
+            if score < 70:
+                with st.expander("🔧 View Optimization Suggestions"):
+                    suggestions = generate_smart_suggestions(video["title"], video["keyword"], api_key, count=3)
+                    for sug in suggestions:
+                        st.code(sug, language='text')
+            else:
+                st.success("✅ Title is well-optimized", icon="✅")
+        
+        with col_score:
+            color = "#10b981" if score >= 80 else "#f59e0b" if score >= 60 else "#ef4444"
+            st.markdown(f"""
+            <div style="text-align: center;">
+                <div style="font-size: 2rem; font-weight: bold; color: {color};">{score}</div>
+                <div style="font-size: 0.8rem; color: #666;">Score</div>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Channel Summary
+    if all_scores:
+        st.markdown("---")
+        st.markdown("### 📊 Channel Performance Summary")
+        
+        avg_score = sum(all_scores) / len(all_scores)
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Average Score", f"{avg_score:.1f}/100")
+        with col2:
+            excellent = sum(1 for s in all_scores if s >= 80)
+            st.metric("Excellent Titles", f"{excellent}/{len(all_scores)}")
+        with col3:
+            needs_work = sum(1 for s in all_scores if s < 60)
+            st.metric("Needs Optimization", f"{needs_work}/{len(all_scores)}")
+        with col4:
+            if avg_score >= 80:
+                st.success("🏆 Great Channel!")
+            elif avg_score >= 60:
+                st.warning("👍 Good Channel")
+            else:
+                st.error("⚠️ Needs Work")
+    
+    # Score Trend
+    trend = AUDIT_HISTORY.run_summary(snapshot["channel_id"])
+    if trend:
+        st.markdown("---")
+        st.markdown("### 📈 Score Trend")
+        if len(trend) > 1:
+            trend_df = pd.DataFrame(trend, columns=["Run", "Videos", "Average Score", "Total Views"]).set_index("Run")
+            col_trend1, col_trend2 = st.columns(2)
+            with col_trend1:
+                st.line_chart(trend_df["Average Score"])
+            with col_trend2:
+                st.line_chart(trend_df["Total Views"])
+        else:
+            st.info("💡 Audit this channel again later to see score and view trends")
+    
+    # Near-Duplicate Titles
+    st.markdown("---")
+    st.markdown("### 🧬 Near-Duplicate Titles")
+    
+    if full_dup_scan and yt is not None:
+        with st.spinner("🔄 Fetching upload history..."):
+            dup_titles = fetch_upload_titles(yt, channel["uploads_playlist"], MAX_DUPLICATE_SCAN)
+    else:
+        dup_titles = [v["title"] for v in videos]
+    render_duplicate_clusters(dup_titles, find_near_duplicates(dup_titles))
+    
+    # Metadata Export
+    st.markdown("---")
+    st.markdown("### 📦 Export Metadata Packages")
+    render_export_buttons(
+        [{"title": v["title"], "keyword": v["keyword"], "video_id": v["video_id"]} for v in videos],
+        key="audit_export"
+    )
+
 # --- 7. SIDEBAR ---
 with st.sidebar:
     st.markdown("### ⚙️ Settings & Status")
@@ -479,20 +485,26 @@ with st.sidebar:
     st.caption("✅ Use power words & numbers")
     st.caption("✅ Add emojis for visibility")
 
-# --- 8. MAIN APP ---
-st.markdown('<h1 class="app-title">🎬 YouTube SEO Pro</h1>', unsafe_allow_html=True)
+# --- 8. VIEWS ---
+# Each view is a fragment: only the active view runs on a full rerun, and a
+# widget inside a view reruns just that view.
 
-tab1, tab2, tab3 = st.tabs(["📝 Title Optimizer", "📊 Channel Audit", "🎯 Bulk Analyzer"])
+def keep_widget_state(keys):
+    """Keep the inputs of hidden views, whose widget state Streamlit would drop"""
+    for key in keys:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
 
-# --- TAB 1: OPTIMIZER ---
-with tab1:
+# --- VIEW 1: OPTIMIZER ---
+@st.fragment
+def render_title_optimizer_view(api_key):
     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
     
     col1, col2 = st.columns([2, 3])
     with col1:
-        keyword = st.text_input("🎯 Target Keyword", placeholder="e.g., relaxing jazz music", help="Main keyword for SEO")
+        keyword = st.text_input("🎯 Target Keyword", placeholder="e.g., relaxing jazz music", help="Main keyword for SEO", key="opt_keyword")
     with col2:
-        title = st.text_input("✍️ Your Video Title", placeholder="Paste or type your title here...", help="Current or draft title")
+        title = st.text_input("✍️ Your Video Title", placeholder="Paste or type your title here...", help="Current or draft title", key="opt_title")
     
     col_btn1, col_btn2, col_btn3 = st.columns([1, 1, 2])
     with col_btn1:
@@ -585,27 +597,76 @@ with tab1:
                 st.caption(f"Generated {len(gen_tags)} optimized tags")
                 tags_text = ", ".join(gen_tags)
                 st.text_area("📋 Copy Tags:", tags_text, height=150, help="Copy and paste into YouTube")
-                st.info(f"💡 Character count: {len(tags_text)}/500")
+                st.info(f"💡 Character count: {tags_length(gen_tags)}/{TAG_CHAR_LIMIT}")
             
             with tab_desc:
                 st.caption("SEO-optimized description with timestamps and hashtags")
                 st.text_area("📋 Copy Description:", gen_desc, height=300, help="Copy and paste into YouTube")
-                st.info(f"💡 Character count: {len(gen_desc)}/5000")
+                st.info(f"💡 Character count: {len(gen_desc)}/{DESCRIPTION_CHAR_LIMIT}")
 
-# --- TAB 2: CHANNEL AUDIT ---
-with tab2:
+# --- VIEW 2: CHANNEL AUDIT ---
+@st.fragment
+def render_channel_audit_view(api_key):
     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
     st.markdown("### 🔍 Channel Intelligence Dashboard")
     
     col_input, col_limit = st.columns([3, 1])
     with col_input:
-        channel_input = st.text_input("📺 Channel ID", placeholder="UC_x5XG1OV2P6uZZ5FSM9Ttw", help="Must start with 'UC'")
+        channel_input = st.text_input("📺 Channel ID", placeholder="UC_x5XG1OV2P6uZZ5FSM9Ttw", help="Must start with 'UC'", key="audit_channel")
     with col_limit:
-        limit = st.selectbox("Videos", [5, 10, 15, 20, 30], index=1)
+        limit = st.selectbox("Videos", [5, 10, 15, 20, 30], key="audit_limit")
     
-    scan_btn = st.button("🚀 Scan Channel", type="primary", use_container_width=True)
+    save_history = st.checkbox("💾 Save this audit to history", help="Stores scores and view counts locally to track trends across audits", key="audit_save_history")
+    full_dup_scan = st.checkbox("🧬 Check duplicates across the full upload history", help=f"Pages through up to {MAX_DUPLICATE_SCAN:,} uploads (1 API unit per 50 videos)", key="audit_full_dup_scan")
+    
+    watchlist = load_watchlist()
+    watched_ids = [w["channel_id"] for w in watchlist]
+    is_watched = channel_input in watched_ids
+    
+    col_scan, col_watch = st.columns([3, 1])
+    with col_scan:
+        scan_btn = st.button("🚀 Scan Channel", type="primary", use_container_width=True)
+    with col_watch:
+        watch_btn = st.button("✖️ Unwatch" if is_watched else "⭐ Watch", use_container_width=True, disabled=not channel_input.startswith("UC"), help="Watched channels are refreshed in the background by watcher.py")
+    
+    if watch_btn:
+        if is_watched:
+            unwatch_channel(channel_input)
+        else:
+            watch_channel(channel_input, limit)
+        st.rerun()
+    
+    open_btn = False
+    if watchlist:
+        col_watched, col_open = st.columns([3, 1])
+        # A stable key and plain option labels: the snapshot ages change every
+        # minute, and a label change would reset an unkeyed selection
+        if st.session_state.get("watched_channel") not in watched_ids:
+            st.session_state.pop("watched_channel", None)
+        with col_watched:
+            watched_id = st.selectbox("⭐ Watched Channels", watched_ids, key="watched_channel")
+            st.caption(f"🕒 {format_age(snapshot_age(watched_id))}")
+        with col_open:
+            st.markdown("<div style='height: 1.75rem;'></div>", unsafe_allow_html=True)
+            open_btn = st.button("⚡ Open Precomputed", use_container_width=True)
     st.markdown('</div>', unsafe_allow_html=True)
     
+    if open_btn:
+        snapshot = load_snapshot(watched_id)
+        failure = load_failure(watched_id)
+        if failure is not None:
+            st.warning(f"⚠️ The last background refresh failed ({failure['failures']}x): {failure['error']}")
+        if snapshot is None:
+            st.info("⏳ Not precomputed yet. Start `python watcher.py` or scan the channel live")
+        else:
+            # Snapshots open without API calls: suggestions stay offline, and
+            # only an opted-in full duplicate scan talks to the API
+            yt = youtube_client(api_key) if api_key and full_dup_scan else None
+            try:
+                render_channel_audit(snapshot, f"🕒 Precomputed {format_age(snapshot_age(watched_id))}", None, yt, full_dup_scan)
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
+    
     if scan_btn:
         if not api_key:
             st.error("⚠️ API Key required for channel analysis")
@@ -614,131 +675,25 @@ with tab2:
         else:
             with st.spinner("🔄 Fetching channel data..."):
                 try:
-                    yt = build('youtube', 'v3', developerKey=api_key)
-                    
-                    # Get channel info
-                    ch_res = yt.channels().list(
-                        id=channel_input, 
-                        part='snippet,statistics,contentDetails,brandingSettings'
-                    ).execute()
-                    
-                    if not ch_res.get('items'):
-                        st.error("❌ Channel not found")
-                        st.stop()
-                    
-                    ch_info = ch_res['items'][0]
-                    stats = ch_info['statistics']
-                    snippet = ch_info['snippet']
-                    
-                    st.markdown("---")
-                    
-                    # Channel Header
-                    col_img, col_info = st.columns([1, 4])
-                    
-                    with col_img:
-                        img_url = snippet['thumbnails'].get('high', snippet['thumbnails'].get('medium'))['url']
-                        st.image(img_url, width=150)
-                    
-                    with col_info:
-                        st.markdown(f"## {snippet['title']}")
-                        st.caption(snippet.get('description', '')[:200] + "...")
-                        
-                        m1, m2, m3, m4 = st.columns(4)
-                        with m1:
-                            st.metric("👥 Subscribers", f"{int(stats.get('subscriberCount', 0)):,}")
-                        with m2:
-                            st.metric("👁️ Total Views", f"{int(stats['viewCount']):,}")
-                        with m3:
-                            st.metric("🎬 Videos", f"{int(stats['videoCount']):,}")
-                        with m4:
-                            avg_views = int(stats['viewCount']) / max(int(stats['videoCount']), 1)
-                            st.metric("📊 Avg Views", f"{int(avg_views):,}")
-                    
-                    st.markdown("---")
-                    
-                    # Get videos
-                    up_id = ch_info['contentDetails']['relatedPlaylists']['uploads']
-                    vids = yt.playlistItems().list(
-                        playlistId=up_id, 
-                        part='snippet', 
-                        maxResults=limit
-                    ).execute()
-                    
-                    st.markdown(f"### 📹 Latest {len(vids['items'])} Videos Analysis")
-                    
-                    # Calculate channel average score
-                    all_scores = []
+                    yt = youtube_client(api_key)
+                    snapshot = run_channel_audit(yt, channel_input, limit, TITLE_RUBRIC)
                     
-                    for idx, item in enumerate(vids['items'], 1):
-                        v_title = item['snippet']['title']
-                        v_img = item['snippet']['thumbnails']['default']['url']
-                        v_date = item['snippet']['publishedAt'][:10]
-                        
-                        # Guess keyword from title
-                        guess_kw = ' '.join(extract_keywords_from_title(v_title, top_n=1)) or v_title.split()[0]
-                        score, checks, recs = analyze_title(v_title, guess_kw)
-                        all_scores.append(score)
-                        
-                        st.markdown('<div class="video-card">', unsafe_allow_html=True)
-                        
-                        col_thumb, col_content, col_score = st.columns([1, 5, 1])
-                        
-                        with col_thumb:
-                            st.image(v_img, width=120)
-                        
-                        with col_content:
-                            st.markdown(f"**#{idx}. {v_title}**")
-                            st.caption(f"📅 Published: {v_date}")
-                            
-                            if score < 70:
-                                with st.expander("🔧 View Optimization Suggestions"):
-                                    suggestions = generate_smart_suggestions(v_title, guess_kw, api_key, count=3)
-                                    for sug in suggestions:
-                                        st.code(sug, language='text')
-                            else:
-                                st.success("✅ Title is well-optimized", icon="✅")
-                        
-                        with col_score:
-                            color = "#10b981" if score >= 80 else "#f59e0b" if score >= 60 else "#ef4444"
-                            st.markdown(f"""
-                            <div style="text-align: center;">
-                                <div style="font-size: 2rem; font-weight: bold; color: {color};">{score}</div>
-                                <div style="font-size: 0.8rem; color: #666;">Score</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        st.markdown('</div>', unsafe_allow_html=True)
+                    if save_history:
+                        AUDIT_HISTORY.append_run(channel_input, history_columns(snapshot))
+                    if is_watched:
+                        save_snapshot(snapshot)
                     
-                    # Channel Summary
-                    if all_scores:
-                        st.markdown("---")
-                        st.markdown("### 📊 Channel Performance Summary")
-                        
-                        avg_score = sum(all_scores) / len(all_scores)
-                        col1, col2, col3, col4 = st.columns(4)
-                        
-                        with col1:
-                            st.metric("Average Score", f"{avg_score:.1f}/100")
-                        with col2:
-                            excellent = sum(1 for s in all_scores if s >= 80)
-                            st.metric("Excellent Titles", f"{excellent}/{len(all_scores)}")
-                        with col3:
-                            needs_work = sum(1 for s in all_scores if s < 60)
-                            st.metric("Needs Optimization", f"{needs_work}/{len(all_scores)}")
-                        with col4:
-                            if avg_score >= 80:
-                                st.success("🏆 Great Channel!")
-                            elif avg_score >= 60:
-                                st.warning("👍 Good Channel")
-                            else:
-                                st.error("⚠️ Needs Work")
+                    render_channel_audit(snapshot, "🔴 Live scan", api_key, yt, full_dup_scan)
                 
+                except AuditError as e:
+                    st.error(f"❌ {e}")
                 except Exception as e:
                     st.error(f"❌ Error: {str(e)}")
                     st.caption("Please check your API key and Channel ID")
 
-# --- TAB 3: BULK ANALYZER ---
-with tab3:
+# --- VIEW 3: BULK ANALYZER ---
+@st.fragment
+def render_bulk_analyzer_view():
     st.markdown('<div class="metric-card">', unsafe_allow_html=True)
     st.markdown("### 📊 Bulk Title Analyzer")
     st.caption("Analyze multiple titles at once")
@@ -746,10 +701,11 @@ with tab3:
     bulk_input = st.text_area(
         "📝 Paste Your Titles (One per line)", 
         height=200,
-        placeholder="Title 1\nTitle 2\nTitle 3\n..."
+        placeholder="Title 1\nTitle 2\nTitle 3\n...",
+        key="bulk_input"
     )
     
-    bulk_keyword = st.text_input("🎯 Common Keyword (Optional)", placeholder="e.g., tutorial")
+    bulk_keyword = st.text_input("🎯 Common Keyword (Optional)", placeholder="e.g., tutorial", key="bulk_keyword")
     
     if st.button("🚀 Analyze All Titles", type="primary", use_container_width=True):
         if bulk_input:
@@ -769,7 +725,7 @@ with tab3:
                     progress_bar.progress((idx + 1) / len(titles_list))
                     
                     kw = bulk_keyword or extract_keywords_from_title(title, top_n=1)[0] if extract_keywords_from_title(title, top_n=1) else ""
-                    score, checks, recs = analyze_title(title, kw)
+                    score = score_title(title, kw)
                     results.append((title, score, kw))
                 
                 status_text.empty()
@@ -791,6 +747,14 @@ with tab3:
                     worst_score = min(s for _, s, _ in results)
                     st.metric("Worst Score", f"{worst_score}/100")
                 
+                st.markdown("---")
+                st.markdown("### 🧬 Near-Duplicate Titles")
+                render_duplicate_clusters(titles_list, find_near_duplicates(titles_list))
+                
+                st.markdown("---")
+                st.markdown("### 📦 Export Metadata Packages")
+                render_export_buttons([{"title": t, "keyword": kw} for t, _, kw in results], key="bulk_export")
+                
                 st.markdown("---")
                 
                 # Results table
@@ -823,6 +787,28 @@ with tab3:
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+# --- 9. MAIN APP ---
+st.markdown('<h1 class="app-title">🎬 YouTube SEO Pro</h1>', unsafe_allow_html=True)
+
+VIEWS = ["📝 Title Optimizer", "📊 Channel Audit", "🎯 Bulk Analyzer"]
+PERSISTENT_WIDGET_KEYS = (
+    "opt_keyword", "opt_title", "audit_channel", "audit_limit",
+    "audit_save_history", "audit_full_dup_scan", "watched_channel", "bulk_input", "bulk_keyword"
+)
+
+st.session_state.setdefault("audit_limit", 10)
+st.session_state.setdefault("audit_save_history", True)
+keep_widget_state(PERSISTENT_WIDGET_KEYS)
+
+active_view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed", key="active_view")
+
+if active_view == VIEWS[0]:
+    render_title_optimizer_view(api_key)
+elif active_view == VIEWS[1]:
+    render_channel_audit_view(api_key)
+else:
+    render_bulk_analyzer_view()
+
 # --- FOOTER ---
 st.markdown("---")
 st.markdown("""
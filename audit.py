@@ -0,0 +1,234 @@
+"""Channel Audit data layer, shared by the app and the watchlist scheduler.
+
+run_channel_audit() makes the API calls and scores the titles. It returns a
+plain JSON-able snapshot, which the Channel Audit tab renders. Snapshots of
+watched channels are precomputed by watcher.py and cached on disk, so the tab
+can open them without touching the API.
+"""
+import datetime
+import json
+import os
+
+from googleapiclient.discovery import build
+
+from scoring import DEFAULT_RUBRIC_PATH, load_rubric
+from seo_core import VIRAL_EMOJIS, guess_keyword
+from stub_api import StubYouTube, load_fixture
+
+STUB_ENV = "SEO_YOUTUBE_STUB"
+DEFAULT_CACHE_DIR = os.environ.get("SEO_AUDIT_CACHE_DIR", ".audit_cache")
+DEFAULT_WATCHLIST_PATH = os.environ.get("SEO_WATCHLIST_PATH", ".watchlist.json")
+DEFAULT_VIDEO_LIMIT = 30
+# channels.list + playlistItems.list + videos.list, 1 unit each
+AUDIT_QUOTA_COST = 3
+
+
+class AuditError(Exception):
+    """Raised when a channel can't be audited (e.g. it doesn't exist)"""
+
+
+def youtube_client(api_key):
+    """YouTube Data API client, or the local stub when SEO_YOUTUBE_STUB is set"""
+    stub_path = os.environ.get(STUB_ENV)
+    if stub_path:
+        return StubYouTube(load_fixture(stub_path))
+    return build('youtube', 'v3', developerKey=api_key)
+
+
+def build_title_rubric(power_words, path=DEFAULT_RUBRIC_PATH):
+    """Compile the title rubric against a power word list"""
+    return load_rubric(path, {"power_words": list(power_words), "viral_emojis": VIRAL_EMOJIS})
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+# --- 1. AUDIT ---
+
+def run_channel_audit(yt, channel_id, limit, rubric):
+    """Fetch a channel and its latest uploads and score every title"""
+    ch_res = yt.channels().list(
+        id=channel_id,
+        part='snippet,statistics,contentDetails,brandingSettings'
+    ).execute()
+    if not ch_res.get('items'):
+        raise AuditError("Channel not found")
+
+    ch_info = ch_res['items'][0]
+    stats = ch_info['statistics']
+    snippet = ch_info['snippet']
+    up_id = ch_info['contentDetails']['relatedPlaylists']['uploads']
+
+    vids = yt.playlistItems().list(
+        playlistId=up_id,
+        part='snippet',
+        maxResults=limit
+    ).execute()
+    items = vids.get('items', [])
+
+    # Get view/like/comment counts for the listed videos
+    video_ids = [item['snippet']['resourceId']['videoId'] for item in items]
+    stats_res = yt.videos().list(id=','.join(video_ids), part='statistics').execute() if video_ids else {}
+    video_stats = {v['id']: v.get('statistics', {}) for v in stats_res.get('items', [])}
+
+    videos = []
+    for item, v_id in zip(items, video_ids):
+        v_title = item['snippet']['title']
+        v_stats = video_stats.get(v_id, {})
+        keyword = guess_keyword(v_title)
+        components = rubric.components(v_title, keyword)
+        videos.append({
+            "video_id": v_id,
+            "title": v_title,
+            "thumbnail": item['snippet']['thumbnails']['default']['url'],
+            "published": item['snippet']['publishedAt'][:10],
+            "keyword": keyword,
+            "score": min(sum(components), rubric.max_score),
+            "components": list(components),
+            "views": int(v_stats.get('viewCount', 0)),
+            "likes": int(v_stats.get('likeCount', 0)),
+            "comments": int(v_stats.get('commentCount', 0)),
+        })
+
+    thumbs = snippet['thumbnails']
+    return {
+        "channel_id": channel_id,
+        "refreshed_at": _now().isoformat(),
+        "limit": limit,
+        "channel": {
+            "title": snippet['title'],
+            "description": snippet.get('description', ''),
+            "thumbnail": thumbs.get('high', thumbs.get('medium'))['url'],
+            "subscribers": int(stats.get('subscriberCount', 0)),
+            "views": int(stats['viewCount']),
+            "videos": int(stats['videoCount']),
+            "uploads_playlist": up_id,
+        },
+        "rule_names": list(rubric.rule_names),
+        "videos": videos,
+    }
+
+
+def history_columns(snapshot):
+    """Columns for AuditHistory.append_run from an audit snapshot"""
+    videos = snapshot["videos"]
+    columns = {
+        "video_id": [v["video_id"] for v in videos],
+        "published_day": [datetime.date.fromisoformat(v["published"]).toordinal() for v in videos],
+        "score": [v["score"] for v in videos],
+        "views": [v["views"] for v in videos],
+        "likes": [v["likes"] for v in videos],
+        "comments": [v["comments"] for v in videos],
+    }
+    for i, name in enumerate(snapshot["rule_names"]):
+        columns[f"score_{name}"] = [v["components"][i] for v in videos]
+    return columns
+
+
+# --- 2. SNAPSHOT CACHE ---
+
+def _snapshot_path(channel_id, cache_dir):
+    return os.path.join(cache_dir, f"{channel_id}.json")
+
+
+def save_snapshot(snapshot, cache_dir=DEFAULT_CACHE_DIR):
+    """Atomically write a snapshot so the app never reads a half-written file"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _snapshot_path(snapshot["channel_id"], cache_dir)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def load_snapshot(channel_id, cache_dir=DEFAULT_CACHE_DIR):
+    """Cached snapshot for a channel, or None"""
+    try:
+        with open(_snapshot_path(channel_id, cache_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def snapshot_age(channel_id, cache_dir=DEFAULT_CACHE_DIR, now=None):
+    """Seconds since a channel's snapshot was written, or None if there is none"""
+    try:
+        mtime = os.path.getmtime(_snapshot_path(channel_id, cache_dir))
+    except OSError:
+        return None
+    return max(0.0, (now or _now()).timestamp() - mtime)
+
+
+def _failure_path(channel_id, cache_dir):
+    return os.path.join(cache_dir, f"{channel_id}.failed.json")
+
+
+def record_failure(channel_id, error, cache_dir=DEFAULT_CACHE_DIR, now=None):
+    """Note a failed refresh so the scheduler backs off instead of retrying every cycle"""
+    previous = load_failure(channel_id, cache_dir)
+    failure = {
+        "failures": (previous["failures"] if previous else 0) + 1,
+        "failed_at": (now or _now()).timestamp(),
+        "error": str(error),
+    }
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _failure_path(channel_id, cache_dir)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(failure, f)
+    os.replace(path + ".tmp", path)
+    return failure
+
+
+def load_failure(channel_id, cache_dir=DEFAULT_CACHE_DIR):
+    """Last refresh failure of a channel as {"failures", "failed_at", "error"}, or None"""
+    try:
+        with open(_failure_path(channel_id, cache_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def clear_failure(channel_id, cache_dir=DEFAULT_CACHE_DIR):
+    try:
+        os.remove(_failure_path(channel_id, cache_dir))
+    except FileNotFoundError:
+        pass
+
+
+def format_age(seconds):
+    """Human freshness label, e.g. '5m ago'"""
+    if seconds is None:
+        return "not precomputed yet"
+    if seconds < 60:
+        return "just now"
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit} ago"
+
+
+# --- 3. WATCHLIST ---
+
+def load_watchlist(path=DEFAULT_WATCHLIST_PATH):
+    """Watched channels as a list of {"channel_id", "limit"} dicts"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("channels", [])
+    except (OSError, ValueError):
+        return []
+
+
+def save_watchlist(channels, path=DEFAULT_WATCHLIST_PATH):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"channels": channels}, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def watch_channel(channel_id, limit=DEFAULT_VIDEO_LIMIT, path=DEFAULT_WATCHLIST_PATH):
+    """Add or update a channel on the watchlist"""
+    channels = [c for c in load_watchlist(path) if c["channel_id"] != channel_id]
+    channels.append({"channel_id": channel_id, "limit": limit})
+    save_watchlist(channels, path)
+
+
+def unwatch_channel(channel_id, path=DEFAULT_WATCHLIST_PATH):
+    save_watchlist([c for c in load_watchlist(path) if c["channel_id"] != channel_id], path)
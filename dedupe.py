@@ -0,0 +1,105 @@
+"""Near-duplicate title detection with MinHash signatures and LSH banding.
+
+Titles are tokenized the same way as keyword extraction (seo_core.tokenize_title)
+and split into word shingles. Each title gets a MinHash signature. Titles whose
+signatures agree on a whole band share a bucket and become candidates, and
+candidates are checked with the estimated Jaccard similarity before they are
+clustered. The whole pass is roughly linear in the number of titles.
+"""
+import hashlib
+from array import array
+from collections import defaultdict
+
+from seo_core import tokenize_title
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.5
+SHINGLE_SIZE = 2
+# Members of one LSH bucket are compared against this many earlier members only,
+# so a bucket of hundreds of near-identical titles stays linear instead of quadratic
+MAX_BUCKET_COMPARISONS = 8
+
+
+def title_shingles(title, size=SHINGLE_SIZE):
+    """Word n-gram shingles of a title's content words"""
+    words = tokenize_title(title)
+    if len(words) < size:
+        # Short or non-word titles (emoji, numbers) still match exact copies
+        return {" ".join(words) or title.strip().lower()}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(shingles, num_perm=DEFAULT_NUM_PERM):
+    """MinHash signature of a shingle set, packed as num_perm uint32 slots
+
+    shake_128 yields num_perm independent 32-bit hashes per shingle in one C
+    call, and the slot-wise minimum is taken by map(min, ...) without a Python
+    loop per slot.
+    """
+    rows = [array("I", hashlib.shake_128(s.encode("utf-8")).digest(4 * num_perm)) for s in shingles]
+    if len(rows) == 1:
+        return rows[0].tobytes()
+    return array("I", map(min, *rows)).tobytes()
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity: share of equal signature slots"""
+    slots_a, slots_b = memoryview(sig_a).cast("I"), memoryview(sig_b).cast("I")
+    return sum(1 for a, b in zip(slots_a, slots_b) if a == b) / len(slots_a)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _union(parent, i, j):
+    ri, rj = _find(parent, i), _find(parent, j)
+    if ri != rj:
+        parent[max(ri, rj)] = min(ri, rj)
+
+
+def find_near_duplicates(titles, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS):
+    """Cluster near-identical titles
+
+    Returns a list of clusters (lists of indices into `titles`, ascending) with
+    two or more members, largest cluster first.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+    rows_per_band = num_perm // bands
+    parent = list(range(len(titles)))
+
+    # Identical signatures are duplicates outright, so only one index per
+    # distinct signature goes through banding
+    by_signature = {}
+    for idx, title in enumerate(titles):
+        sig = minhash_signature(title_shingles(title), num_perm)
+        first = by_signature.setdefault(sig, idx)
+        if first != idx:
+            _union(parent, first, idx)
+
+    signatures = list(by_signature.items())
+    for band in range(bands):
+        lo, hi = band * rows_per_band, (band + 1) * rows_per_band
+        buckets = defaultdict(list)
+        for sig, idx in signatures:
+            buckets[sig[4 * lo:4 * hi]].append((sig, idx))
+        for members in buckets.values():
+            for pos in range(1, len(members)):
+                sig, idx = members[pos]
+                for other_sig, other_idx in members[max(0, pos - MAX_BUCKET_COMPARISONS):pos]:
+                    if _find(parent, idx) == _find(parent, other_idx):
+                        continue
+                    if estimate_similarity(sig, other_sig) >= threshold:
+                        _union(parent, idx, other_idx)
+
+    clusters = defaultdict(list)
+    for idx in range(len(titles)):
+        clusters[_find(parent, idx)].append(idx)
+    found = [members for members in clusters.values() if len(members) > 1]
+    found.sort(key=lambda members: (-len(members), members[0]))
+    return found
@@ -0,0 +1,158 @@
+"""Streaming export of tags + description packages for whole catalogs.
+
+Packages are built lazily and in input order. With several workers, titles go
+to a process pool in chunks, and only a bounded window of chunks is in flight,
+so memory stays flat no matter how large the catalog is. Tag and description
+budgets are enforced inside generate_tags / generate_description.
+
+Command line:
+
+    python export.py titles.txt -o packages.jsonl
+    python export.py catalog.jsonl -o packages.zip --workers 8 --corpus
+
+Input is a text file with one title per line, or a .jsonl file of objects with
+"title" and optional "keyword" / "video_id".
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from seo_core import generate_tags, generate_description, guess_keyword, keyword_corpus_scores, tags_length
+
+CHUNK_SIZE = 256
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+
+def build_package(item, corpus_scores=None):
+    """Tags + description package for one {"title", "keyword"?, "video_id"?} item"""
+    title = item["title"]
+    keyword = item.get("keyword") or guess_keyword(title)
+    tags = generate_tags(title, keyword, enhanced=True, corpus_scores=corpus_scores)
+    description = generate_description(title, keyword, tags, enhanced=True)
+    package = {
+        "title": title,
+        "keyword": keyword,
+        "tags": tags,
+        "tags_chars": tags_length(tags),
+        "description": description,
+        "description_chars": len(description),
+    }
+    if item.get("video_id"):
+        package["video_id"] = item["video_id"]
+    return package
+
+
+# Set once per worker process so the corpus isn't pickled with every chunk
+_worker_corpus_scores = None
+
+
+def _init_worker(corpus_scores):
+    global _worker_corpus_scores
+    _worker_corpus_scores = corpus_scores
+
+
+def _build_chunk(chunk):
+    return [build_package(item, _worker_corpus_scores) for item in chunk]
+
+
+def _chunks(items, size):
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _as_item(item, keyword):
+    if isinstance(item, str):
+        item = {"title": item}
+    if keyword and not item.get("keyword"):
+        item = dict(item, keyword=keyword)
+    return item
+
+
+def iter_packages(items, keyword="", workers=1, chunk_size=CHUNK_SIZE, corpus_scores=None):
+    """Lazily yield packages for titles (str) or item dicts, in input order
+
+    `corpus_scores` (see seo_core.keyword_corpus_scores) boosts tags for words
+    that are common across the catalog.
+    """
+    items = (_as_item(item, keyword) for item in items)
+    if workers <= 1:
+        for item in items:
+            yield build_package(item, corpus_scores)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(corpus_scores,)) as pool:
+        pending = deque()
+        for chunk in _chunks(items, chunk_size):
+            pending.append(pool.submit(_build_chunk, chunk))
+            if len(pending) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_jsonl(packages, fp):
+    """Stream packages to a binary file as JSON lines; returns the count"""
+    count = 0
+    for package in packages:
+        fp.write((json.dumps(package, ensure_ascii=False) + "\n").encode("utf-8"))
+        count += 1
+    return count
+
+
+def _slug(text):
+    return re.sub(r'\W+', '-', text.lower()).strip('-')[:40] or "video"
+
+
+def write_zip(packages, fp):
+    """Stream packages into a zip, one folder with tags.txt/description.txt each"""
+    count = 0
+    with zipfile.ZipFile(fp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for count, package in enumerate(packages, 1):
+            folder = f"{count:06d}_{package.get('video_id') or _slug(package['title'])}"
+            zf.writestr(f"{folder}/tags.txt", ", ".join(package["tags"]))
+            zf.writestr(f"{folder}/description.txt", package["description"])
+    return count
+
+
+def _read_items(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            yield json.loads(line) if path.endswith(".jsonl") else line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export tags + description packages for a catalog of titles")
+    parser.add_argument("input", help="titles .txt (one per line) or .jsonl with title/keyword/video_id")
+    parser.add_argument("-o", "--output", required=True, help="output .jsonl or .zip")
+    parser.add_argument("--keyword", default="", help="keyword for items that don't have one")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--corpus", action="store_true", help="extra pass to weight tags by word frequency across the catalog")
+    args = parser.parse_args(argv)
+
+    corpus_scores = None
+    if args.corpus:
+        corpus_scores = keyword_corpus_scores(
+            item if isinstance(item, str) else item["title"] for item in _read_items(args.input)
+        )
+    packages = iter_packages(_read_items(args.input), args.keyword, args.workers, corpus_scores=corpus_scores)
+    writer = write_zip if args.output.endswith(".zip") else write_jsonl
+    with open(args.output, "wb") as fp:
+        count = writer(packages, fp)
+    print(f"Exported {count} packages to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Columnar audit history store.
+
+Channel Audit runs are appended to one file per channel and UTC date:
+
+    <root>/<channel_id>/<YYYY-MM-DD>.runs
+
+Each run is one record: a length-prefixed JSON header (run time, row count and
+the type and byte size of every column) followed by the columns as contiguous
+blocks. Numeric columns are raw stdlib `array` dumps (2 bytes for scores, 8 for
+counts), string columns are newline-joined UTF-8. A query opens one file per
+day in range, reads only the column blocks it asks for and seeks past the rest.
+Days outside the range are skipped by file name without being opened.
+
+A record is written with a single append, so the app and watcher.py can add
+runs to the same day at once, and a run is never overwritten, even when two
+share a timestamp.
+"""
+import datetime
+import json
+import os
+import struct
+import time
+from array import array
+
+DEFAULT_HISTORY_DIR = os.environ.get("SEO_HISTORY_DIR", ".audit_history")
+PARTITION_SUFFIX = ".runs"
+STRING = "str"
+HEADER_SIZE = struct.Struct("<I")
+
+# Typecodes for known columns; rubric components ("score_<rule>") are signed
+# shorts too, since rubric.json may give a rule negative (penalty) points
+COLUMN_TYPES = {
+    "video_id": STRING,
+    "title": STRING,
+    "published_day": "i",
+    "score": "h",
+    "views": "q",
+    "likes": "q",
+    "comments": "q",
+}
+
+
+def column_type(name):
+    """Storage typecode for a column name"""
+    if name in COLUMN_TYPES:
+        return COLUMN_TYPES[name]
+    return "h" if name.startswith("score_") else "q"
+
+
+def _day_of(run_ms):
+    return datetime.datetime.fromtimestamp(run_ms / 1000, datetime.timezone.utc).date()
+
+
+def _encode(typecode, values):
+    if typecode == STRING:
+        # YouTube titles can't contain newlines, but be safe about it
+        return "\n".join(str(v).replace("\n", " ") for v in values).encode("utf-8")
+    return array(typecode, values).tobytes()
+
+
+def _decode(typecode, data, rows):
+    if typecode == STRING:
+        return data.decode("utf-8").split("\n")[:rows] if rows else []
+    values = array(typecode)
+    values.frombytes(data)
+    return values
+
+
+class Run:
+    """One stored audit run with the columns that were read for it"""
+
+    def __init__(self, run_ms, rows, types, columns):
+        self.run_ms = run_ms
+        self.rows = rows
+        self.types = types
+        self.columns = columns
+
+    @property
+    def run_time(self):
+        return datetime.datetime.fromtimestamp(self.run_ms / 1000, datetime.timezone.utc)
+
+    def column(self, name):
+        """A loaded column as an array (numeric) or list (strings), or None"""
+        if name == "run_ms":
+            return array("q", [self.run_ms]) * self.rows
+        return self.columns.get(name)
+
+
+def _read_partition(path, names):
+    """Yield the Runs of one day file, loading only the named columns"""
+    with open(path, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        while f.tell() + HEADER_SIZE.size <= end:
+            (header_size,) = HEADER_SIZE.unpack(f.read(HEADER_SIZE.size))
+            try:
+                meta = json.loads(f.read(header_size))
+            except ValueError:
+                return
+            types, columns = {}, {}
+            for name, typecode, size in meta["columns"]:
+                types[name] = typecode
+                if name in names:
+                    block = f.read(size)
+                    if len(block) < size:
+                        return
+                    columns[name] = _decode(typecode, block, meta["rows"])
+                else:
+                    f.seek(size, os.SEEK_CUR)
+            if f.tell() > end:
+                # A record cut short by a crash mid-write
+                return
+            yield Run(meta["run_ms"], meta["rows"], types, columns)
+
+
+class AuditHistory:
+    """Append-only, channel/date partitioned store of audit runs"""
+
+    def __init__(self, root=DEFAULT_HISTORY_DIR):
+        self.root = root
+
+    def channels(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+
+    def append_run(self, channel_id, columns, run_time=None):
+        """Write one run; `columns` maps column name -> equal-length list of values"""
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns of a run must have the same length")
+        rows = lengths.pop() if lengths else 0
+        run_ms = int((run_time.timestamp() if run_time else time.time()) * 1000)
+
+        # Encode everything first: a bad value (e.g. out of range) writes nothing
+        specs, blocks = [], []
+        for name, values in columns.items():
+            typecode = column_type(name)
+            block = _encode(typecode, values)
+            specs.append([name, typecode, len(block)])
+            blocks.append(block)
+        header = json.dumps({"run_ms": run_ms, "rows": rows, "columns": specs}).encode("utf-8")
+        record = HEADER_SIZE.pack(len(header)) + header + b"".join(blocks)
+
+        channel_dir = os.path.join(self.root, channel_id)
+        os.makedirs(channel_dir, exist_ok=True)
+        path = os.path.join(channel_dir, _day_of(run_ms).isoformat() + PARTITION_SUFFIX)
+        # One write on an O_APPEND descriptor, so concurrent writers don't interleave
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            written = os.write(fd, record)
+        finally:
+            os.close(fd)
+        if written != len(record):
+            raise OSError(f"Short write to {path} ({written} of {len(record)} bytes)")
+        return run_ms
+
+    def runs(self, channel_id, columns=(), start=None, end=None):
+        """Yield Runs of a channel, oldest first, for dates in [start, end]"""
+        channel_dir = os.path.join(self.root, channel_id)
+        if not os.path.isdir(channel_dir):
+            return
+        first = start.isoformat() if start else ""
+        last = end.isoformat() if end else "9999-12-31"
+        names = set(columns)
+        for name in sorted(os.listdir(channel_dir)):
+            day = name[:-len(PARTITION_SUFFIX)]
+            if not name.endswith(PARTITION_SUFFIX) or not first <= day <= last:
+                continue
+            # Runs are appended in write order; keep ties in that order
+            yield from sorted(_read_partition(os.path.join(channel_dir, name), names), key=lambda run: run.run_ms)
+
+    def query(self, channel_id, columns, start=None, end=None):
+        """Concatenate the requested columns over a date range
+
+        Missing columns (e.g. a rubric rule added later) read as zeros / empty
+        strings so the result stays rectangular.
+        """
+        out = {name: [] if column_type(name) == STRING else array(column_type(name)) for name in columns}
+        for run in self.runs(channel_id, columns, start, end):
+            for name in columns:
+                values = run.column(name)
+                if values is None:
+                    values = [""] * run.rows if column_type(name) == STRING else [0] * run.rows
+                elif isinstance(values, array) and values.typecode != out[name].typecode:
+                    # Runs written before a column's type changed
+                    values = values.tolist()
+                out[name].extend(values)
+        return out
+
+    def run_summary(self, channel_id, start=None, end=None):
+        """Per-run aggregates for trend charts, one day file in memory at a time
+
+        Returns a list of (run_time, videos, avg_score, total_views).
+        """
+        summary = []
+        for run in self.runs(channel_id, ("score", "views"), start, end):
+            if not run.rows:
+                continue
+            scores = run.column("score")
+            views = run.column("views")
+            summary.append((
+                run.run_time,
+                run.rows,
+                sum(scores) / run.rows if scores is not None else 0.0,
+                sum(views) if views is not None else 0,
+            ))
+        return summary
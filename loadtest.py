@@ -0,0 +1,433 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Starts one `streamlit run` server for analyzer.py against stub_api.py and
+connects N simulated users to it over the app's websocket, the same way browser
+tabs do. Each session runs the Title Optimizer, Bulk Analyzer and Channel Audit
+flows. Like the frontend, a session sends the values of the widgets it changed
+with each rerun request, and for a widget inside an `st.fragment` it asks for a
+rerun of that fragment only. All sessions share one server process, its
+caches and its script threads, as real users do.
+
+Latency is measured per interaction, from sending the rerun request until the
+server reports the run finished. It is reported as percentiles per flow and
+split into full-script reruns and fragment reruns. --app serves another script
+with the same widgets, e.g. an older revision, so both can be compared.
+
+Memory per session is the growth of the server's resident set from after a
+throwaway warm-up session (imports, shared caches) to the point where all N
+sessions have run their flows and are still connected, divided by N. It is the
+per-user state the server holds: session state, widget values and the
+rendered page of each session. Cache entries first filled by the measured
+sessions count too, so small runs overstate it; use 8+ sessions for a steady
+number.
+
+    python loadtest.py --sessions 8 --iterations 3
+    python loadtest.py --sessions 16 --max-p95-ms 1500 --max-mb-per-session 40   # CI guard
+
+It exits with status 1 when a threshold is exceeded or a session raises.
+Needs the `websockets` package, which newer Streamlit releases install.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from stub_api import make_fixture
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyzer.py")
+RUN_TIMEOUT = 120
+STARTUP_TIMEOUT = 60
+PERCENTILES = (50, 90, 95, 99)
+FLOWS = ("title_optimizer", "bulk_analyzer", "channel_audit")
+
+
+# --- 1. BROWSER SESSION ---
+
+def _widget(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def _widget_state(kind, proto, value):
+    """WidgetState the frontend sends for a widget set to `value`"""
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    state = WidgetState(id=proto.id)
+    if kind == "button":
+        state.trigger_value = True
+    elif kind == "checkbox":
+        state.bool_value = value
+    elif kind == "radio" and "raw_value" not in proto.DESCRIPTOR.fields_by_name:
+        # Older releases send a radio's option index
+        state.int_value = list(proto.options).index(value)
+    else:
+        state.string_value = value
+    return state
+
+
+class RemoteSession:
+    """One websocket session of the app, driven like a browser tab
+
+    The rendered page is kept as the latest delta per element path and parsed
+    into an AppTest element tree, which is only used to find widgets by label.
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.page_script_hash = ""
+        self.elements = {}
+        self.widget_states = {}
+        self.values = {}
+        self.triggers = set()
+        self.fragment_of = {}
+        self.fragment_id = ""
+        self.tree = None
+        self.scoped = {"full_reruns": [], "fragment_reruns": []}
+
+    def widget(self, kind, label):
+        return _widget(getattr(self.tree, kind), label)
+
+    def selected(self, label):
+        """Current option of a radio: what this session picked, else its default"""
+        node = self.widget("radio", label)
+        return self.values.get(node.id, node.options[node.proto.default])
+
+    def set_value(self, kind, label, value):
+        node = self.widget(kind, label)
+        self.values[node.id] = value
+        self._changed(node, _widget_state(kind, node.proto, value))
+
+    def click(self, label):
+        node = self.widget("button", label)
+        self.triggers.add(node.id)
+        self._changed(node, _widget_state("button", node.proto, True))
+
+    def _changed(self, node, state):
+        self.widget_states[node.id] = state
+        # The frontend reruns only the fragment a widget was rendered by
+        self.fragment_id = self.fragment_of.get(node.id, "")
+
+    async def run(self, samples):
+        """Send one rerun request and wait until the server has finished it"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.testing.v1.element_tree import parse_tree_from_messages
+
+        request = BackMsg()
+        request.rerun_script.query_string = ""
+        request.rerun_script.page_script_hash = self.page_script_hash
+        request.rerun_script.widget_states.widgets.extend(self.widget_states.values())
+        if self.fragment_id:
+            request.rerun_script.fragment_id = self.fragment_id
+        fragment_id, updated = self.fragment_id, set()
+
+        start = time.perf_counter()
+        await self.ws.send(request.SerializeToString())
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await asyncio.wait_for(self.ws.recv(), RUN_TIMEOUT))
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                self.page_script_hash = msg.new_session.page_script_hash or msg.new_session.main_script_hash
+            elif kind == "delta" and msg.delta.WhichOneof("type") != "new_transient":
+                path = tuple(msg.metadata.delta_path)
+                self.elements[path] = msg
+                updated.add(path)
+            elif kind == "script_finished" and msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        elapsed = (time.perf_counter() - start) * 1000
+        samples.append(elapsed)
+        self.scoped["fragment_reruns" if fragment_id else "full_reruns"].append(elapsed)
+
+        # Button presses are one-shot; elements the run didn't redraw are gone
+        for widget_id in self.triggers:
+            self.widget_states.pop(widget_id, None)
+        self.triggers.clear()
+        self.fragment_id = ""
+        self.elements = {
+            path: msg for path, msg in self.elements.items()
+            if path in updated or (fragment_id and msg.delta.fragment_id != fragment_id)
+        }
+        self.fragment_of = {}
+        for msg in self.elements.values():
+            if msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                widget_id = getattr(getattr(element, element.WhichOneof("type")), "id", None)
+                if widget_id:
+                    self.fragment_of[widget_id] = msg.delta.fragment_id
+        self.tree = parse_tree_from_messages([self.elements[path] for path in sorted(self.elements)])
+        if self.tree.exception:
+            raise RuntimeError(self.tree.exception[0].proto.message)
+
+
+# --- 2. SESSION FLOWS ---
+
+async def _open_view(session, view, samples):
+    """Switch the app's view selector; a no-op rerun is skipped if already there
+
+    Apps laid out with st.tabs have no selector and render every view.
+    """
+    if not any(radio.label == "View" for radio in session.tree.radio):
+        return
+    if session.selected("View") != view:
+        session.set_value("radio", "View", view)
+        await session.run(samples)
+
+
+async def flow_title_optimizer(session, fixture, rng, samples):
+    video = rng.choice(rng.choice(list(fixture["channels"].values()))["videos"])
+    await _open_view(session, "📝 Title Optimizer", samples)
+    session.set_value("text_input", "🎯 Target Keyword", video["title"].split()[0].lower())
+    await session.run(samples)
+    session.set_value("text_input", "✍️ Your Video Title", video["title"])
+    await session.run(samples)
+    session.click("🔍 Analyze Title")
+    await session.run(samples)
+
+
+async def flow_bulk_analyzer(session, fixture, rng, samples):
+    videos = rng.choice(list(fixture["channels"].values()))["videos"]
+    titles = [v["title"] for v in rng.sample(videos, min(25, len(videos)))]
+    await _open_view(session, "🎯 Bulk Analyzer", samples)
+    session.set_value("text_area", "📝 Paste Your Titles (One per line)", "\n".join(titles))
+    await session.run(samples)
+    session.click("🚀 Analyze All Titles")
+    await session.run(samples)
+
+
+async def flow_channel_audit(session, fixture, rng, samples):
+    session.set_value("text_input", "API Key", "stub-key")
+    await session.run(samples)
+    await _open_view(session, "📊 Channel Audit", samples)
+    session.set_value("text_input", "📺 Channel ID", rng.choice(list(fixture["channels"])))
+    await session.run(samples)
+    session.click("🚀 Scan Channel")
+    await session.run(samples)
+
+
+FLOW_FUNCS = {
+    "title_optimizer": flow_title_optimizer,
+    "bulk_analyzer": flow_bulk_analyzer,
+    "channel_audit": flow_channel_audit,
+}
+
+
+# --- 3. SERVER ---
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app_path, port, env):
+    """Launch `streamlit run` and wait until it answers its health check"""
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", app_path,
+         "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2) as res:
+                if res.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.5)
+    proc.kill()
+    raise RuntimeError("streamlit did not start in time")
+
+
+def _rss_bytes(pid):
+    """Resident set size of a process, or None where /proc isn't available"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+async def run_session(url, fixture, seed, iterations, flows, result, done, release):
+    """Run one simulated user; stays connected until `release` is set
+
+    `done` is called exactly once, also when connecting fails, so run_load
+    never waits on a session that is gone.
+    """
+    import websockets
+
+    reported = False
+
+    def report():
+        nonlocal reported
+        if not reported:
+            reported = True
+            done()
+
+    try:
+        async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            session = RemoteSession(ws)
+            rng = random.Random(seed)
+            try:
+                await session.run(result["latencies"].setdefault("initial_load", []))
+                session.scoped["full_reruns"].clear()
+                for _ in range(iterations):
+                    for flow in flows:
+                        await FLOW_FUNCS[flow](session, fixture, rng, result["latencies"].setdefault(flow, []))
+            finally:
+                result["latencies"].update(session.scoped)
+                report()
+            await release.wait()
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        report()
+
+
+async def run_load(url, pid, fixture, args, flows):
+    """Warm up, then run all sessions concurrently; returns (results, mb_per_session)"""
+    warmup = {"latencies": {}, "error": None}
+    released = asyncio.Event()
+    released.set()
+    await run_session(url, fixture, args.seed + 10_000, 1, flows, warmup, lambda: None, released)
+    if warmup["error"]:
+        raise RuntimeError(f"Warm-up session failed: {warmup['error']}")
+    before = _rss_bytes(pid)
+
+    results = [{"latencies": {}, "error": None} for _ in range(args.sessions)]
+    finished = asyncio.Event()
+    release = asyncio.Event()
+    pending = [args.sessions]
+
+    def done():
+        pending[0] -= 1
+        if not pending[0]:
+            finished.set()
+
+    tasks = [
+        asyncio.create_task(run_session(url, fixture, args.seed + i, args.iterations, flows, results[i], done, release))
+        for i in range(args.sessions)
+    ]
+    await finished.wait()
+    after = _rss_bytes(pid)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    mb = None
+    if before is not None and after is not None:
+        mb = round(max(0, after - before) / args.sessions / 2**20, 1)
+    return results, mb
+
+
+# --- 4. REPORT ---
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(samples)
+    rank = max(1, -(-pct * len(ordered) // 100))
+    return ordered[rank - 1]
+
+
+def summarize(results, mb_per_session):
+    latencies = {}
+    for result in results:
+        for flow, samples in result["latencies"].items():
+            latencies.setdefault(flow, []).extend(samples)
+    latencies["all_reruns"] = [s for flow, samples in latencies.items() if flow in FLOWS for s in samples]
+
+    report = {"latency_ms": {}, "errors": [r["error"] for r in results if r["error"]]}
+    for flow, samples in latencies.items():
+        if samples:
+            stats = {f"p{p}": round(percentile(samples, p), 1) for p in PERCENTILES}
+            stats.update(reruns=len(samples), max=round(max(samples), 1))
+            report["latency_ms"][flow] = stats
+    report["mb_per_session"] = mb_per_session
+    return report
+
+
+def print_report(report, sessions):
+    print(f"\nSessions: {sessions} on one server")
+    print(f"{'flow':<18}{'reruns':>8}" + "".join(f"{'p' + str(p):>10}" for p in PERCENTILES) + f"{'max':>10}")
+    for flow, stats in report["latency_ms"].items():
+        print(f"{flow:<18}{stats['reruns']:>8}" + "".join(f"{stats['p' + str(p)]:>10}" for p in PERCENTILES) + f"{stats['max']:>10}")
+    mb = report["mb_per_session"]
+    print(f"\nServer memory per session: {mb} MB" if mb is not None else "\nServer memory per session: n/a")
+    for error in report["errors"]:
+        print(f"❌ {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for analyzer.py")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent simulated users")
+    parser.add_argument("--iterations", type=int, default=2, help="times each session repeats the flows")
+    parser.add_argument("--flows", default=",".join(FLOWS), help=f"comma-separated subset of {', '.join(FLOWS)}")
+    parser.add_argument("--channels", type=int, default=3, help="stub channels")
+    parser.add_argument("--videos", type=int, default=50, help="stub videos per channel")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--app", default=APP_PATH, help="app script to serve (default: analyzer.py)")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if the p95 rerun latency exceeds this")
+    parser.add_argument("--max-mb-per-session", type=float, help="fail if server memory per session exceeds this")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    flows = [f.strip() for f in args.flows.split(",") if f.strip()]
+    unknown = set(flows) - set(FLOWS)
+    if unknown:
+        parser.error(f"unknown flows: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture = make_fixture(args.channels, args.videos, args.seed)
+        fixture_path = os.path.join(tmp, "fixture.json")
+        with open(fixture_path, "w", encoding="utf-8") as f:
+            json.dump(fixture, f)
+        # The server gets the stub API and throwaway history/cache/watchlist
+        env = dict(
+            os.environ,
+            SEO_YOUTUBE_STUB=fixture_path,
+            SEO_HISTORY_DIR=os.path.join(tmp, "history"),
+            SEO_AUDIT_CACHE_DIR=os.path.join(tmp, "cache"),
+            SEO_WATCHLIST_PATH=os.path.join(tmp, "watchlist.json"),
+        )
+
+        port = _free_port()
+        server = start_server(os.path.abspath(args.app), port, env)
+        try:
+            start = time.perf_counter()
+            results, mb = asyncio.run(run_load(f"ws://127.0.0.1:{port}/_stcore/stream", server.pid, fixture, args, flows))
+            elapsed = time.perf_counter() - start
+        finally:
+            server.terminate()
+            server.wait()
+
+    report = summarize(results, mb)
+    report.update(sessions=args.sessions, iterations=args.iterations, wall_seconds=round(elapsed, 1))
+    print_report(report, args.sessions)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = bool(report["errors"])
+    p95 = report["latency_ms"].get("all_reruns", {}).get("p95")
+    if args.max_p95_ms is not None and p95 is not None and p95 > args.max_p95_ms:
+        print(f"❌ p95 rerun latency {p95} ms exceeds {args.max_p95_ms} ms")
+        failed = True
+    if args.max_mb_per_session is not None and mb is not None and mb > args.max_mb_per_session:
+        print(f"❌ {mb} MB per session exceeds {args.max_mb_per_session} MB")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
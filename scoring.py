@@ -0,0 +1,223 @@
+"""Declarative title scoring rubric.
+
+The rules and weights live in a JSON config (rubric.json by default). They are
+compiled once into a Rubric: numeric bands become lookup tables and vocabularies
+become one precompiled search. Rubric.score() only adds up points and never builds
+check or recommendation strings, so the bulk and audit paths use it.
+"""
+import json
+import os
+import random
+import re
+from collections import namedtuple
+
+DEFAULT_RUBRIC_PATH = os.environ.get("SEO_RUBRIC_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rubric.json"))
+STATUSES = ("success", "warning", "error", "info")
+
+# A resolved band: points plus the (optional) message templates shown in the UI
+Band = namedtuple("Band", "points status check recommendation")
+Rule = namedtuple("Rule", "name score explain")
+
+NO_BAND = Band(0, None, None, None)
+
+
+class RubricError(ValueError):
+    """Raised when a rubric config cannot be compiled"""
+
+
+# --- 1. BAND HELPERS ---
+
+def _band(spec, rule_name):
+    """Validate a band spec and turn it into a Band tuple"""
+    if spec is None:
+        return NO_BAND
+    status = spec.get("status")
+    if status is not None and status not in STATUSES:
+        raise RubricError(f"Rule '{rule_name}': unknown status '{status}'")
+    if spec.get("check") and status is None:
+        raise RubricError(f"Rule '{rule_name}': a check message needs a status")
+    return Band(int(spec.get("points", 0)), status, spec.get("check"), spec.get("recommendation"))
+
+
+def _band_table(specs, rule_name):
+    """Compile ordered min/max bands (first match wins) into a lookup table
+
+    table[v] is the band for value v; values past the end share the last entry,
+    which is exact because every finite bound is below len(table) - 1.
+    """
+    bands = [(spec.get("min"), spec.get("max"), _band(spec, rule_name)) for spec in specs]
+    top = max((b for lo, hi, _ in bands for b in (lo, hi) if b is not None), default=0) + 1
+    table = []
+    for value in range(top + 1):
+        for lo, hi, band in bands:
+            if (lo is None or value >= lo) and (hi is None or value <= hi):
+                table.append(band)
+                break
+        else:
+            table.append(NO_BAND)
+    return tuple(table)
+
+
+def _lookup(table, value):
+    return table[value] if value < len(table) else table[-1]
+
+
+def _explain(band, **fields):
+    """Format a band's check/recommendation for the detailed view"""
+    check = (band.status, band.check.format(**fields)) if band.check else None
+    rec = band.recommendation.format(**fields) if band.recommendation else None
+    return band.points, check, rec
+
+
+# --- 2. RULE COMPILERS ---
+
+def _compile_length(spec, vocabularies):
+    name = spec["name"]
+    table = _band_table(spec["bands"], name)
+
+    def score(title, lowered, kw):
+        return _lookup(table, len(title)).points
+
+    def explain(title, lowered, kw):
+        length = len(title)
+        return _explain(_lookup(table, length), length=length)
+
+    return Rule(name, score, explain)
+
+
+def _compile_keyword_position(spec, vocabularies):
+    name = spec["name"]
+    table = _band_table(spec["bands"], name)
+    no_keyword = _band(spec.get("no_keyword"), name)
+    missing = _band(spec.get("missing"), name)
+
+    def pick(lowered, kw):
+        if not kw:
+            return no_keyword, -1
+        position = lowered.find(kw)
+        if position < 0:
+            return missing, position
+        return _lookup(table, position), position
+
+    def score(title, lowered, kw):
+        return pick(lowered, kw)[0].points
+
+    def explain(title, lowered, kw):
+        band, position = pick(lowered, kw)
+        return _explain(band, position=position, keyword=kw)
+
+    return Rule(name, score, explain)
+
+
+def _compile_vocabulary(spec, vocabularies):
+    name = spec["name"]
+    vocab_name = spec["vocabulary"]
+    if vocab_name not in vocabularies:
+        raise RubricError(f"Rule '{name}': unknown vocabulary '{vocab_name}'")
+    # Empty terms (e.g. a blank line in the online list) would match every title
+    terms = [t for t in vocabularies[vocab_name] if t]
+    ignore_case = spec.get("ignore_case", False)
+    needles = [t.lower() for t in terms] if ignore_case else terms
+    # One alternation answers "any term present?" in a single pass
+    finder = re.compile("|".join(re.escape(n) for n in needles)) if needles else None
+    hit, miss = _band(spec.get("hit"), name), _band(spec.get("miss"), name)
+    show, joiner, sample = spec.get("show"), spec.get("join", ", "), spec.get("sample", 0)
+
+    def score(title, lowered, kw):
+        text = lowered if ignore_case else title
+        return hit.points if finder is not None and finder.search(text) else miss.points
+
+    def explain(title, lowered, kw):
+        text = lowered if ignore_case else title
+        found = [t for t, n in zip(terms, needles) if n in text]
+        if found:
+            return _explain(hit, matches=joiner.join(found[:show]))
+        picks = random.sample(terms, min(sample, len(terms))) if sample else []
+        return _explain(miss, sample=joiner.join(picks))
+
+    return Rule(name, score, explain)
+
+
+def _compile_pattern(spec, vocabularies):
+    name = spec["name"]
+    try:
+        pattern = re.compile(spec["pattern"])
+    except re.error as e:
+        raise RubricError(f"Rule '{name}': bad pattern ({e})") from e
+    hit, miss = _band(spec.get("hit"), name), _band(spec.get("miss"), name)
+    show, joiner = spec.get("show"), spec.get("join", ", ")
+
+    def score(title, lowered, kw):
+        return hit.points if pattern.search(title) else miss.points
+
+    def explain(title, lowered, kw):
+        found = pattern.findall(title)
+        if found:
+            return _explain(hit, matches=joiner.join(found[:show]))
+        return _explain(miss)
+
+    return Rule(name, score, explain)
+
+
+RULE_TYPES = {
+    "length": _compile_length,
+    "keyword_position": _compile_keyword_position,
+    "vocabulary": _compile_vocabulary,
+    "pattern": _compile_pattern,
+}
+
+
+# --- 3. RUBRIC ---
+
+class Rubric:
+    """A compiled rule set; build one with compile_rubric() or load_rubric()"""
+
+    def __init__(self, rules, max_score=100):
+        self.rules = tuple(rules)
+        self.rule_names = tuple(rule.name for rule in self.rules)
+        self.max_score = max_score
+
+    def components(self, title, keyword=""):
+        """Score-only evaluation per rule, ordered like rule_names"""
+        lowered = title.lower()
+        kw = keyword.lower()
+        return tuple(rule.score(title, lowered, kw) for rule in self.rules)
+
+    def score(self, title, keyword=""):
+        """Score-only evaluation: no message strings, no random samples"""
+        lowered = title.lower()
+        kw = keyword.lower()
+        return min(sum(rule.score(title, lowered, kw) for rule in self.rules), self.max_score)
+
+    def analyze(self, title, keyword=""):
+        """Full evaluation returning (score, checks, recommendations)"""
+        lowered = title.lower()
+        kw = keyword.lower()
+        total = 0
+        checks = []
+        recommendations = []
+        for rule in self.rules:
+            points, check, rec = rule.explain(title, lowered, kw)
+            total += points
+            if check:
+                checks.append(check)
+            if rec:
+                recommendations.append(rec)
+        return min(total, self.max_score), checks, recommendations
+
+
+def compile_rubric(config, vocabularies):
+    """Compile a rubric config dict against the given vocabularies"""
+    rules = []
+    for spec in config.get("rules", []):
+        rule_type = spec.get("type")
+        if rule_type not in RULE_TYPES:
+            raise RubricError(f"Rule '{spec.get('name')}': unknown type '{rule_type}'")
+        rules.append(RULE_TYPES[rule_type](spec, vocabularies))
+    return Rubric(rules, config.get("max_score", 100))
+
+
+def load_rubric(path, vocabularies):
+    """Load a JSON rubric config from disk and compile it"""
+    with open(path, encoding="utf-8") as f:
+        return compile_rubric(json.load(f), vocabularies)
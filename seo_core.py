@@ -0,0 +1,231 @@
+"""Streamlit-free text helpers shared by the app and the offline jobs"""
+import datetime
+import re
+from collections import Counter
+
+import requests
+
+URL_DATABASE_ONLINE = "https://gist.githubusercontent.com/rhanierex/f2d76f11df8d550376d81b58124d3668/raw/0b58a1eb02a7cffc2261a1c8d353551f3337001c/gistfile1.txt"
+FALLBACK_POWER_WORDS = ["secret", "best", "exposed", "tutorial", "guide", "review", "tips", "ultimate", "proven", "insane", "shocking", "amazing", "perfect", "easy", "fast", "free"]
+VIRAL_EMOJIS = ["🔥", "😱", "🔴", "✅", "❌", "🎵", "⚠️", "⚡", "🚀", "💰", "💯", "🤯", "😭", "😡", "😴", "🌙", "✨", "💤", "🌧️", "🎹", "🎯", "💎", "🏆", "👑"]
+STOP_WORDS = {"the", "and", "or", "for", "to", "in", "on", "at", "by", "with", "a", "an", "is", "it", "of", "that", "this", "video", "how", "what", "why", "when"}
+
+WORD_PATTERN = re.compile(r'\b[a-z]{3,}\b')
+
+def fetch_power_words(url=URL_DATABASE_ONLINE):
+    """Power word list from the online database, or the offline fallback"""
+    try:
+        response = requests.get(url, timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, list):
+                return data, "🟢 Database Online"
+    except:
+        pass
+    return FALLBACK_POWER_WORDS, "🟠 Using Offline Database"
+
+def tokenize_title(title):
+    """Lowercase content words of a title, in order, without stop words"""
+    return [w for w in WORD_PATTERN.findall(title.lower()) if w not in STOP_WORDS]
+
+def extract_keywords_from_title(title, top_n=5):
+    """Extract most important keywords using frequency analysis"""
+    counter = Counter(tokenize_title(title))
+    return [word for word, _ in counter.most_common(top_n)]
+
+# --- METADATA PACKAGE ---
+
+TAG_CHAR_LIMIT = 500
+DESCRIPTION_CHAR_LIMIT = 5000
+MAX_TAGS = 20
+TITLE_CHAR_LIMIT = 100
+
+def smart_truncate(text, max_length):
+    """Truncate text intelligently at word boundaries"""
+    text = text.strip()
+    if len(text) <= max_length:
+        return text
+    truncated = text[:max_length-3].rsplit(' ', 1)[0]
+    return truncated + "..."
+
+def guess_keyword(title):
+    """Best-effort target keyword for a title that came without one"""
+    extracted = extract_keywords_from_title(title, top_n=1)
+    if extracted:
+        return extracted[0]
+    words = title.split()
+    return words[0] if words else ""
+
+def tags_length(tags):
+    """Character count of a tag list as pasted into YouTube"""
+    return len(", ".join(tags))
+
+# Tag weights: the target keyword and its variants outrank words from the title.
+# The keyword's year variant ranks just below the keyword itself, while year
+# variants of extracted title keywords are worth half of their base tag
+KEYWORD_WEIGHT = 100
+KEYWORD_YEAR_WEIGHT = 70
+KEYWORD_PAIR_WEIGHT = 60
+KEYWORD_HEAD_WEIGHT = 50
+TITLE_WORD_WEIGHT = 20
+TITLE_REPEAT_BONUS = 5
+TOP_KEYWORD_BONUS = 15
+CORPUS_WEIGHT = 30
+
+def keyword_corpus_scores(titles):
+    """Document frequency of each content word across titles, scaled to 0-1"""
+    df = Counter()
+    for title in titles:
+        df.update(set(tokenize_title(title)))
+    if not df:
+        return {}
+    top = max(df.values())
+    return {word: count / top for word, count in df.items()}
+
+def rank_tag_candidates(title, keyword, enhanced=True, corpus_scores=None):
+    """Map each candidate tag to an integer weight"""
+    year = datetime.datetime.now().year
+    corpus_scores = corpus_scores or {}
+    weights = {}
+    
+    def offer(tag, weight):
+        tag = tag.strip()
+        if tag and weight > weights.get(tag, 0):
+            weights[tag] = weight
+    
+    # Primary keyword
+    kw = keyword.lower().strip()
+    offer(kw, KEYWORD_WEIGHT)
+    if kw:
+        offer(f"{kw} {year}", KEYWORD_YEAR_WEIGHT)
+    
+    # Words from the title, boosted by repetition and by the corpus
+    clean_title = re.sub(r'[^\w\s]', '', title.lower())
+    words = [w for w in clean_title.split() if w not in STOP_WORDS and len(w) > 2]
+    counts = Counter(words)
+    for word in words:
+        bonus = TITLE_REPEAT_BONUS * (counts[word] - 1) + round(CORPUS_WEIGHT * corpus_scores.get(word, 0))
+        offer(word, TITLE_WORD_WEIGHT + bonus)
+    
+    if enhanced:
+        # Keyword variations
+        kw_words = kw.split()
+        if len(kw_words) > 1:
+            offer(kw_words[0], KEYWORD_HEAD_WEIGHT)
+            offer(' '.join(kw_words[:2]), KEYWORD_PAIR_WEIGHT)
+        
+        # Top related search terms and their year variants
+        for word in extract_keywords_from_title(title)[:3]:
+            weight = TITLE_WORD_WEIGHT + TOP_KEYWORD_BONUS + round(CORPUS_WEIGHT * corpus_scores.get(word, 0))
+            offer(word, weight)
+            offer(f"{word} {year}", weight // 2)
+    
+    return weights
+
+def pack_tags(weights, max_chars=TAG_CHAR_LIMIT, max_tags=MAX_TAGS):
+    """Pick the highest-weight tag set that fits the character budget
+
+    A 0/1 knapsack over characters with a tag-count cap. Each tag costs its
+    length plus the ", " separator, and the budget gets 2 extra for the first
+    tag, which has no separator. Ties break by rank, so the result is
+    deterministic. The result is sorted by weight, highest first.
+    """
+    # Rank: weight desc, then shorter, then alphabetical
+    ranked = sorted(weights.items(), key=lambda tw: (-tw[1], len(tw[0]), tw[0]))
+    capacity = max_chars + 2
+    
+    # Fast path: the top max_tags by weight already fit, which is optimal
+    top = ranked[:max_tags]
+    if sum(len(t) + 2 for t, _ in top) <= capacity:
+        return [t for t, _ in top]
+    
+    # best[k] maps chars used -> (weight, chosen rank indexes) for k tags
+    best = [{0: (0, ())}] + [{} for _ in range(max_tags)]
+    for i, (tag, weight) in enumerate(ranked):
+        cost = len(tag) + 2
+        if cost > capacity:
+            continue
+        for k in range(min(i, max_tags - 1), -1, -1):
+            for used, (total, chosen) in list(best[k].items()):
+                new_used = used + cost
+                if new_used > capacity:
+                    continue
+                current = best[k + 1].get(new_used)
+                if current is None or total + weight > current[0]:
+                    best[k + 1][new_used] = (total + weight, chosen + (i,))
+    
+    _, chosen = max(
+        (state for states in best for state in states.values()),
+        key=lambda state: (state[0], [-i for i in state[1]])
+    )
+    return [ranked[i][0] for i in chosen]
+
+def generate_tags(title, keyword, enhanced=True, max_chars=TAG_CHAR_LIMIT, max_tags=MAX_TAGS, corpus_scores=None):
+    """Generate the most valuable tags that fit YouTube's character budget"""
+    return pack_tags(rank_tag_candidates(title, keyword, enhanced, corpus_scores), max_chars, max_tags)
+
+def generate_description(title, keyword, tags, enhanced=True, max_chars=DESCRIPTION_CHAR_LIMIT):
+    """Generate SEO-optimized description, never exceeding the character budget
+
+    The description is assembled section by section; optional sections that
+    would overflow the budget are skipped.
+    """
+    year = datetime.datetime.now().year
+    month = datetime.datetime.now().strftime("%B")
+    title = smart_truncate(title, TITLE_CHAR_LIMIT)
+    keyword = smart_truncate(keyword, TITLE_CHAR_LIMIT)
+    
+    top_tags = tags[:5]
+    hashtags = ' '.join([f"#{tag.replace(' ', '')}" for tag in top_tags])
+    
+    if enhanced:
+        required = [f"🎬 **{title}**"]
+        optional = [
+            f"""📌 **About This Video:**
+In this comprehensive guide, we dive deep into **{keyword}**. Whether you're a beginner or advanced, this {year} tutorial will help you master {keyword}.""",
+            f"""⏱️ **Timestamps:**
+0:00 - Introduction
+0:45 - What is {keyword}?
+2:30 - Step-by-step {keyword} guide
+5:15 - Pro tips and tricks
+7:30 - Common mistakes to avoid
+9:00 - Conclusion & Next steps""",
+            f"""🔥 **Why Watch This?**
+✅ Updated for {month} {year}
+✅ Practical examples
+✅ Expert insights
+✅ Proven techniques""",
+            f"""💡 **Related Topics:**
+{', '.join(top_tags)}""",
+            """🔔 **Don't Forget to:**
+• SUBSCRIBE for more content
+• LIKE if this helped you
+• COMMENT your questions below
+• SHARE with friends""",
+            """📱 **Follow Us:**
+[Add your social media links]""",
+            hashtags,
+            f"""---
+© {year} | {keyword.title()} Guide | All Rights Reserved""",
+        ]
+    else:
+        required = [f"🔴 **{title}**"]
+        optional = [
+            f"In this video, we explore **{keyword}**. Complete guide for {year}.",
+            f"""👇 **Timestamps:**
+0:00 Intro
+0:30 {keyword.title()}
+5:00 Conclusion""",
+            "🔔 **SUBSCRIBE!**",
+            f"""#Hashtags:
+{hashtags}""",
+        ]
+    
+    # Sections are joined by a blank line and the text ends with a newline
+    sections = [smart_truncate(s, max_chars - 1) for s in required]
+    used = sum(len(s) for s in sections) + 1
+    for section in optional:
+        if used + len(section) + 2 <= max_chars:
+            sections.append(section)
+            used += len(section) + 2
+    return "\n\n".join(sections) + "\n"
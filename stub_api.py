@@ -0,0 +1,173 @@
+"""Local stand-in for the YouTube Data API v3 client.
+
+StubYouTube answers the calls the app and the watchlist scheduler make
+(channels, playlistItems, videos and search `.list(...).execute()`) from an
+in-memory fixture, and counts quota units like the real API. Point the app or
+the scheduler at a fixture file with SEO_YOUTUBE_STUB=path/to/fixture.json.
+
+    python stub_api.py fixture.json --channels 5 --videos 200
+
+writes a synthetic fixture.
+"""
+import argparse
+import datetime
+import json
+import random
+from collections import Counter
+
+# Quota cost per call, as documented for the Data API
+QUOTA_COSTS = {"channels": 1, "playlistItems": 1, "videos": 1, "search": 100}
+MAX_RESULTS = 50
+
+SAMPLE_WORDS = ["relaxing", "jazz", "music", "sleep", "study", "piano", "rain", "sounds", "guitar", "lofi",
+                "beats", "ambient", "focus", "coffee", "night", "morning", "chill", "calm", "deep", "cozy"]
+SAMPLE_SUFFIXES = ["", " 🌙", " (8 Hours)", " [2024]", " 🔥", " - Best Playlist", " | 10 Tips"]
+
+
+def _thumbnails(seed):
+    url = f"https://i.ytimg.com/vi/{seed}/default.jpg"
+    return {size: {"url": url} for size in ("default", "medium", "high")}
+
+
+class _Request:
+    def __init__(self, api, resource, fn, kwargs):
+        self.api, self.resource, self.fn, self.kwargs = api, resource, fn, kwargs
+
+    def execute(self):
+        self.api.calls[self.resource] += 1
+        self.api.units_used += QUOTA_COSTS[self.resource]
+        return self.fn(**self.kwargs)
+
+
+class _Resource:
+    def __init__(self, api, name, fn):
+        self.api, self.name, self.fn = api, name, fn
+
+    def list(self, **kwargs):
+        return _Request(self.api, self.name, self.fn, kwargs)
+
+
+class StubYouTube:
+    """Fixture-backed replacement for googleapiclient's youtube v3 resource"""
+
+    def __init__(self, fixture):
+        self.channels_by_id = fixture.get("channels", {})
+        self.uploads = {f"UU{cid[2:]}": cid for cid in self.channels_by_id}
+        self.videos_by_id = {v["id"]: v for ch in self.channels_by_id.values() for v in ch.get("videos", [])}
+        self.units_used = 0
+        self.calls = Counter()
+
+    def channels(self):
+        return _Resource(self, "channels", self._channels)
+
+    def playlistItems(self):
+        return _Resource(self, "playlistItems", self._playlist_items)
+
+    def videos(self):
+        return _Resource(self, "videos", self._videos)
+
+    def search(self):
+        return _Resource(self, "search", self._search)
+
+    def _channels(self, id, part=None, **_):
+        items = []
+        for cid in id.split(","):
+            ch = self.channels_by_id.get(cid)
+            if ch is None:
+                continue
+            items.append({
+                "id": cid,
+                "snippet": {"title": ch["title"], "description": ch.get("description", ""), "thumbnails": _thumbnails(cid)},
+                "statistics": {
+                    "subscriberCount": str(ch.get("subscribers", 0)),
+                    "viewCount": str(sum(v.get("views", 0) for v in ch.get("videos", []))),
+                    "videoCount": str(len(ch.get("videos", []))),
+                },
+                "contentDetails": {"relatedPlaylists": {"uploads": f"UU{cid[2:]}"}},
+            })
+        return {"items": items}
+
+    def _playlist_items(self, playlistId, part=None, maxResults=5, pageToken=None, **_):
+        ch = self.channels_by_id.get(self.uploads.get(playlistId), {})
+        videos = ch.get("videos", [])
+        start = int(pageToken or 0)
+        end = start + min(maxResults, MAX_RESULTS)
+        res = {"items": [{
+            "snippet": {
+                "title": v["title"],
+                "publishedAt": v["published"],
+                "thumbnails": _thumbnails(v["id"]),
+                "resourceId": {"kind": "youtube#video", "videoId": v["id"]},
+            }
+        } for v in videos[start:end]]}
+        if end < len(videos):
+            res["nextPageToken"] = str(end)
+        return res
+
+    def _videos(self, id, part=None, **_):
+        items = []
+        for vid in id.split(",")[:MAX_RESULTS]:
+            v = self.videos_by_id.get(vid)
+            if v is not None:
+                items.append({"id": vid, "statistics": {
+                    "viewCount": str(v.get("views", 0)),
+                    "likeCount": str(v.get("likes", 0)),
+                    "commentCount": str(v.get("comments", 0)),
+                }})
+        return {"items": items}
+
+    def _search(self, q="", maxResults=5, **_):
+        words = set(q.lower().split())
+        hits = [v for v in self.videos_by_id.values() if words & set(v["title"].lower().split())]
+        hits.sort(key=lambda v: -v.get("views", 0))
+        return {"items": [{"snippet": {"title": v["title"]}} for v in hits[:maxResults]]}
+
+
+def make_fixture(channels=3, videos=50, seed=0):
+    """Deterministic synthetic fixture with near-duplicate-heavy titles"""
+    rng = random.Random(seed)
+    start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    fixture = {"channels": {}}
+    for c in range(channels):
+        cid = f"UCstub{c:018d}"
+        vids = []
+        for v in range(videos):
+            title = " ".join(rng.sample(SAMPLE_WORDS, rng.randint(3, 7))).title() + rng.choice(SAMPLE_SUFFIXES)
+            published = start + datetime.timedelta(days=v * 3 + c)
+            vids.append({
+                "id": f"v{c:03d}{v:07d}",
+                "title": title,
+                "published": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "views": rng.randint(100, 2_000_000),
+                "likes": rng.randint(0, 50_000),
+                "comments": rng.randint(0, 5_000),
+            })
+        vids.reverse()  # uploads playlists list newest first
+        fixture["channels"][cid] = {
+            "title": f"Stub Channel {c}",
+            "description": "Synthetic channel served by stub_api.py",
+            "subscribers": rng.randint(1_000, 5_000_000),
+            "videos": vids,
+        }
+    return fixture
+
+
+def load_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic YouTube API fixture for StubYouTube")
+    parser.add_argument("output")
+    parser.add_argument("--channels", type=int, default=3)
+    parser.add_argument("--videos", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(make_fixture(args.channels, args.videos, args.seed), f, ensure_ascii=False)
+    print(f"Wrote {args.channels} channels x {args.videos} videos to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
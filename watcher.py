@@ -0,0 +1,160 @@
+"""Background scheduler that keeps watchlist audits precomputed.
+
+Every --interval seconds it refreshes the watched channels whose snapshot is
+older than --max-age, stalest first. A channel whose refresh fails is retried
+with an exponential backoff rather than every cycle. It stops for the day once
+the next audit would exceed --quota-budget API units. Spent units are kept in a
+small ledger that resets with the API quota day (midnight Pacific). Each
+refresh writes the snapshot the Channel Audit tab opens and appends the run to
+the audit history.
+
+    python watcher.py --api-key KEY
+    SEO_YOUTUBE_STUB=fixture.json python watcher.py --once    # against stub_api.py
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import time
+
+from audit import (
+    AUDIT_QUOTA_COST, DEFAULT_CACHE_DIR, DEFAULT_VIDEO_LIMIT, DEFAULT_WATCHLIST_PATH,
+    build_title_rubric, clear_failure, history_columns, load_failure, load_watchlist,
+    record_failure, run_channel_audit, save_snapshot, snapshot_age, youtube_client
+)
+from history import AuditHistory
+from seo_core import fetch_power_words
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:
+    QUOTA_TZ = datetime.timezone.utc
+
+DEFAULT_QUOTA_BUDGET = 2000
+DEFAULT_INTERVAL = 15 * 60
+DEFAULT_MAX_AGE = 6 * 3600
+MAX_FAILURE_BACKOFF = 7 * 86400
+LEDGER_FILE = "_quota.json"
+
+log = logging.getLogger("watcher")
+
+
+class QuotaLedger:
+    """API units spent today (quota day), persisted next to the snapshots"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.path = os.path.join(cache_dir, LEDGER_FILE)
+
+    def _today(self, now=None):
+        return (now or datetime.datetime.now(datetime.timezone.utc)).astimezone(QUOTA_TZ).date().isoformat()
+
+    def used(self, now=None):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        return data["used"] if data.get("day") == self._today(now) else 0
+
+    def spend(self, units, now=None):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {"day": self._today(now), "used": self.used(now) + units}
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(self.path + ".tmp", self.path)
+
+
+def failure_backoff(failures, max_age=DEFAULT_MAX_AGE):
+    """Seconds to wait before retrying a channel that failed `failures` times in a row"""
+    return min(max_age * 2 ** (failures - 1), MAX_FAILURE_BACKOFF)
+
+
+def due_channels(watchlist, cache_dir=DEFAULT_CACHE_DIR, max_age=DEFAULT_MAX_AGE, now=None):
+    """Watched channels that need a refresh, never-audited first, then the stalest
+
+    A channel whose last refresh failed counts its age from that attempt and
+    waits out failure_backoff(), so a bad ID doesn't jump the queue every cycle.
+    """
+    now_ts = (now or datetime.datetime.now(datetime.timezone.utc)).timestamp()
+    due = []
+    for entry in watchlist:
+        channel_id = entry["channel_id"]
+        age = snapshot_age(channel_id, cache_dir, now)
+        wait = max_age
+        failure = load_failure(channel_id, cache_dir)
+        if failure is not None:
+            since_failure = max(0.0, now_ts - failure["failed_at"])
+            age = since_failure if age is None else min(age, since_failure)
+            wait = failure_backoff(failure["failures"], max_age)
+        if age is None or age >= wait:
+            due.append((age, entry))
+    due.sort(key=lambda d: -(d[0] if d[0] is not None else float("inf")))
+    return [entry for _, entry in due]
+
+
+def refresh_cycle(yt, rubric, watchlist, ledger, quota_budget, cache_dir=DEFAULT_CACHE_DIR,
+                  history=None, max_age=DEFAULT_MAX_AGE, now=None):
+    """Refresh due channels within the remaining quota; returns refreshed channel IDs"""
+    due = due_channels(watchlist, cache_dir, max_age, now)
+
+    refreshed = []
+    for attempted, entry in enumerate(due):
+        channel_id = entry["channel_id"]
+        if ledger.used(now) + AUDIT_QUOTA_COST > quota_budget:
+            log.info("Quota budget of %d units reached, %d channels left for later", quota_budget, len(due) - attempted)
+            break
+        try:
+            try:
+                snapshot = run_channel_audit(yt, channel_id, entry.get("limit", DEFAULT_VIDEO_LIMIT), rubric)
+            finally:
+                ledger.spend(AUDIT_QUOTA_COST, now)
+            save_snapshot(snapshot, cache_dir)
+            if history is not None:
+                history.append_run(channel_id, history_columns(snapshot))
+        except Exception as e:
+            failure = record_failure(channel_id, e, cache_dir, now)
+            log.warning("Refreshing %s failed (%d in a row, retrying in %ds): %s", channel_id,
+                        failure["failures"], failure_backoff(failure["failures"], max_age), e)
+            continue
+        clear_failure(channel_id, cache_dir)
+        refreshed.append(channel_id)
+        log.info("Refreshed %s (%d videos)", channel_id, len(snapshot["videos"]))
+    return refreshed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute Channel Audits for the watchlist")
+    parser.add_argument("--api-key", default=os.environ.get("YOUTUBE_API_KEY", ""))
+    parser.add_argument("--watchlist", default=DEFAULT_WATCHLIST_PATH)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--quota-budget", type=int, default=DEFAULT_QUOTA_BUDGET, help="API units per quota day")
+    parser.add_argument("--interval", type=int, default=DEFAULT_INTERVAL, help="seconds between cycles")
+    parser.add_argument("--max-age", type=int, default=DEFAULT_MAX_AGE, help="refresh snapshots older than this (seconds)")
+    parser.add_argument("--no-history", action="store_true", help="don't append refreshes to the audit history")
+    parser.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    yt = youtube_client(args.api_key)
+    power_words, db_status = fetch_power_words()
+    log.info("Power words: %s", db_status)
+    rubric = build_title_rubric(power_words)
+    ledger = QuotaLedger(args.cache_dir)
+    history = None if args.no_history else AuditHistory()
+
+    while True:
+        try:
+            refresh_cycle(yt, rubric, load_watchlist(args.watchlist), ledger, args.quota_budget,
+                          args.cache_dir, history, args.max_age)
+        except Exception:
+            # e.g. the cache dir became unwritable; try again next cycle
+            log.exception("Refresh cycle failed")
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()